@@ -8,11 +8,20 @@ AutoSleepとHRVデータを統合し、分析結果を生成します
 """
 
 import logging
+from functools import lru_cache
 import pandas as pd
 from utils.file_parser import read_autosleep_data, parse_hrv_file
 from utils.date_utils import convert_time_slot_to_hour, format_time_part
 
-def calculate_daytime_hrv_integral(hrv_data, wakeup_datetime, next_bedtime_datetime=None):
+# 結果データフレームの列
+RESULT_COLUMNS = [
+    'Date', 'Bedtime', 'Wakeup',
+    'Daytime HRV Avg (ms)', 'Avg Breathing Rate',
+    'Sleep Duration (HH:MM:SS)'
+]
+
+def calculate_daytime_hrv_integral(hrv_data, wakeup_datetime, next_bedtime_datetime=None,
+                                   slot_to_hour=None):
     """
     起床時間から次の就寝時間までの日中HRV平均値を微分積分アプローチで計算します
     
@@ -20,6 +29,7 @@ def calculate_daytime_hrv_integral(hrv_data, wakeup_datetime, next_bedtime_datet
         hrv_data (dict): 時間帯別HRV値
         wakeup_datetime (datetime): 起床時間
         next_bedtime_datetime (datetime, optional): 次の就寝時間、Noneの場合は制限なし
+        slot_to_hour (dict, optional): 時間帯文字列から時刻への対応表、Noneの場合はその場で変換
     
     戻り値:
         float: 日中のHRV平均値、データがない場合はNone
@@ -34,16 +44,35 @@ def calculate_daytime_hrv_integral(hrv_data, wakeup_datetime, next_bedtime_datet
         # 次の就寝時間が設定されている場合
         next_bedtime_hour = next_bedtime_datetime.hour
     
-    # 起床時間以降かつ次の就寝時間より前の時間帯のHRV値を時間順にソート
-    daytime_data = []
+    if slot_to_hour is None:
+        slot_to_hour = {time_slot: convert_time_slot_to_hour(time_slot) for time_slot in hrv_data}
+    
+    # 時刻とHRV値の組を時間順にソートしてハッシュ可能なキーにする
+    hrv_items = tuple(sorted(
+        ((slot_to_hour.get(time_slot, -1), hrv_value)
+         for time_slot, hrv_value in hrv_data.items()),
+        key=lambda x: x[0]
+    ))
+    
+    return _integral_core(hrv_items, wakeup_hour, next_bedtime_hour)
+
+@lru_cache(maxsize=2048)
+def _integral_core(hrv_items, wakeup_hour, next_bedtime_hour):
+    """
+    日中HRV平均値の積分計算本体（同じ入力の再計算を避けるため結果をキャッシュ）
     
-    for time_slot, hrv_value in hrv_data.items():
-        hour = convert_time_slot_to_hour(time_slot)
-        if hour >= 0 and hour >= wakeup_hour and hour < next_bedtime_hour:
-            daytime_data.append((hour, hrv_value))
+    引数:
+        hrv_items (tuple): 時刻順にソートされた (時刻, HRV値) の組
+        wakeup_hour (int): 起床時刻（時）
+        next_bedtime_hour (int): 次の就寝時刻（時）
     
-    # 時間順にソート
-    daytime_data.sort(key=lambda x: x[0])
+    戻り値:
+        float: 日中のHRV平均値、データがない場合はNone
+    """
+    # 起床時間以降かつ次の就寝時間より前の時間帯のHRV値を抽出
+    # （変換失敗の-1は起床時刻（0以上）より常に小さいため、この比較で除外される）
+    daytime_data = [(hour, hrv_value) for hour, hrv_value in hrv_items
+                    if wakeup_hour <= hour < next_bedtime_hour]
     
     if len(daytime_data) < 2:
         # データポイントが1つ以下の場合は通常の平均値を返す
@@ -78,6 +107,43 @@ def calculate_daytime_hrv_integral(hrv_data, wakeup_datetime, next_bedtime_datet
     
     return None
 
+def _process_record(index, sleep_record, next_bedtime_dt, wakeup_hrv, slot_to_hour):
+    """
+    睡眠レコード1件を処理し、結果の行データを作成します
+    
+    引数:
+        index (int): レコード番号（0始まり）
+        sleep_record (namedtuple): 睡眠レコード（列名の空白は「_」に置換済み）
+        next_bedtime_dt (datetime): 次の就寝時間、Noneの場合は制限なし
+        wakeup_hrv (dict): 起床日の時間帯別HRV値
+        slot_to_hour (dict): 時間帯文字列から時刻への対応表
+    
+    戻り値:
+        dict: 結果の行データ、日時解析エラーの場合はNone
+    """
+    # 就寝・起床時間の取得
+    bedtime_dt = sleep_record.Bedtime_dt
+    wakeup_dt = sleep_record.Wakeup_dt
+    
+    if pd.isna(bedtime_dt) or pd.isna(wakeup_dt):
+        logging.warning(f"レコード {index+1}: 日時解析エラー、スキップします")
+        return None
+    
+    # 日中HRV平均値を計算（微分積分アプローチを使用）
+    avg_daytime_hrv = calculate_daytime_hrv_integral(
+        wakeup_hrv, wakeup_dt, next_bedtime_dt, slot_to_hour
+    )
+    
+    return {
+        'Date': sleep_record.Date,  # すでに起床日が入っています（file_parser.pyの修正により）
+        'Bedtime': format_time_part(sleep_record.Bedtime),
+        'Wakeup': format_time_part(sleep_record.Wakeup),
+        'Daytime HRV Avg (ms)': 
+            str(avg_daytime_hrv) if avg_daytime_hrv is not None else 'N/A',
+        'Avg Breathing Rate': getattr(sleep_record, 'Avg_Breathing_Rate', 'N/A'),
+        'Sleep Duration (HH:MM:SS)': getattr(sleep_record, 'Sleep_Duration', 'N/A')
+    }
+
 def process_sleep_hrv_data(sleep_file_path, hrv_file_path, progress_callback=None):
     """
     AutoSleepとHRVデータを統合処理し、分析結果を生成します
@@ -107,55 +173,41 @@ def process_sleep_hrv_data(sleep_file_path, hrv_file_path, progress_callback=Non
         hrv_data = parse_hrv_file(hrv_file_path)
         logging.info(f"HRVデータを読み込みました: {len(hrv_data)}日分")
         
+        # 全日分の時間帯文字列を一度だけ時刻に変換
+        all_slots = {time_slot for day_hrv in hrv_data.values() for time_slot in day_hrv}
+        slot_to_hour = {time_slot: convert_time_slot_to_hour(time_slot) for time_slot in all_slots}
+        
         if progress_callback:
             progress_callback(50)
         
-        # 結果データフレームの準備
-        result_df = pd.DataFrame(columns=[
-            'Date', 'Bedtime', 'Wakeup',
-            'Daytime HRV Avg (ms)', 'Avg Breathing Rate',
-            'Sleep Duration (HH:MM:SS)'
-        ])
+        # 列名の空白を置換し、属性としてアクセスできるレコード一覧を用意
+        sleep_records = list(
+            sleep_data.rename(columns=lambda c: c.replace(' ', '_')).itertuples(index=False)
+        )
+        record_count = len(sleep_records)
         
-        # 各睡眠レコードを処理
-        for i, (_, sleep_record) in enumerate(sleep_data.iterrows()):
+        # 結果の行データを蓄積し、最後に一度だけデータフレームを作成
+        # （1件あたりの処理は軽く、プロセス並列化は起動・転送コストの方が大きいため逐次処理）
+        rows = []
+        for i, sleep_record in enumerate(sleep_records):
             # 進捗状況更新
-            if progress_callback and len(sleep_data) > 0:
-                progress_value = 50 + int((i / len(sleep_data)) * 40)
+            if progress_callback:
+                progress_value = 50 + int((i / record_count) * 40)
                 progress_callback(min(progress_value, 90))
             
-            # 就寝・起床時間の取得
-            bedtime_dt = sleep_record.get('Bedtime_dt')
-            wakeup_dt = sleep_record.get('Wakeup_dt')
-            
-            if bedtime_dt is None or wakeup_dt is None:
-                logging.warning(f"レコード {i+1}: 日時解析エラー、スキップします")
-                continue
-            
-            # 起床日のHRVデータを取得
-            wakeup_date = wakeup_dt.strftime('%Y/%m/%d')
-            wakeup_hrv = hrv_data.get(wakeup_date, {})
-            
             # 次のレコードがあれば、その就寝時間を取得
-            next_bedtime_dt = None
-            if i + 1 < len(sleep_data):
-                next_record = sleep_data.iloc[i + 1]
-                next_bedtime_dt = next_record.get('Bedtime_dt')
+            next_bedtime_dt = sleep_records[i + 1].Bedtime_dt if i + 1 < record_count else None
+            if pd.isna(next_bedtime_dt):
+                next_bedtime_dt = None
             
-            # 日中HRV平均値を計算（微分積分アプローチを使用）
-            avg_daytime_hrv = calculate_daytime_hrv_integral(wakeup_hrv, wakeup_dt, next_bedtime_dt)
+            # 起床日のHRVデータを取得（Dateは読み込み時に起床日から一括で整形済み）
+            wakeup_hrv = hrv_data.get(sleep_record.Date, {})
             
-            # 結果に新しい行データを追加
-            new_row = pd.DataFrame({
-                'Date': [sleep_record['Date']],  # すでに起床日が入っています（file_parser.pyの修正により）
-                'Bedtime': [format_time_part(sleep_record['Bedtime'])],
-                'Wakeup': [format_time_part(sleep_record['Wakeup'])],
-                'Daytime HRV Avg (ms)': 
-                    [str(avg_daytime_hrv) if avg_daytime_hrv is not None else 'N/A'],
-                'Avg Breathing Rate': [sleep_record.get('Avg Breathing Rate', 'N/A')],
-                'Sleep Duration (HH:MM:SS)': [sleep_record.get('Sleep Duration', 'N/A')]
-            })
-            result_df = pd.concat([result_df, new_row], ignore_index=True)
+            row = _process_record(i, sleep_record, next_bedtime_dt, wakeup_hrv, slot_to_hour)
+            if row is not None:
+                rows.append(row)
+        
+        result_df = pd.DataFrame(rows, columns=RESULT_COLUMNS)
         
         if progress_callback:
             progress_callback(95)
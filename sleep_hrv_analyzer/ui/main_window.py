@@ -7,7 +7,12 @@ UIレイアウトとイベントハンドラを定義します
 """
 
 import os
+import atexit
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging.handlers import QueueHandler, QueueListener
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QFileDialog, QProgressBar,
@@ -19,6 +24,63 @@ from utils.pdf_generator import generate_pdf_report
 from data_processor import process_sleep_hrv_data
 from .widgets import DataTableModel, ResultTableView
 
+# データ処理用のプロセスプール（結果のDataFrameはpickleで受け渡されます）
+# 最初の分析実行時に作成し、プロセスが異常終了した場合は作り直します
+_executor = None
+
+# 子プロセスのログを親プロセスのハンドラへ転送するキューとリスナー
+_log_queue = None
+_log_listener = None
+
+
+def _init_worker_logging(log_queue, level):
+    """
+    子プロセスのロギングを設定します（プロセスプールのinitializer）
+    
+    spawn方式（macOSの既定）で起動した子プロセスではmain.setup_logging()が
+    実行されないため、ログレコードをキュー経由で親プロセスに転送します
+    """
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(QueueHandler(log_queue))
+    root_logger.setLevel(level)
+
+
+def _get_executor():
+    """
+    データ処理用のプロセスプールを返します（未作成の場合は作成）
+    """
+    global _executor, _log_queue, _log_listener
+    
+    root_logger = logging.getLogger()
+    if _log_listener is None:
+        _log_queue = multiprocessing.Queue()
+        _log_listener = QueueListener(
+            _log_queue, *root_logger.handlers, respect_handler_level=True
+        )
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+    
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_init_worker_logging,
+            initargs=(_log_queue, root_logger.level)
+        )
+    return _executor
+
+
+def _reset_executor():
+    """
+    異常終了したプロセスプールを破棄します（次回の_get_executorで作り直されます）
+    """
+    global _executor
+    
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+
 
 class WorkerSignals(QObject):
     """
@@ -29,29 +91,52 @@ class WorkerSignals(QObject):
     error = pyqtSignal(str)
 
 
-class DataProcessWorker(QThread):
+class DataProcessWorker(QObject):
     """
-    データ処理をバックグラウンドで実行するワーカー
+    データ処理を別プロセスで実行するワーカー
+    
+    CPU負荷の高い処理をGILの影響を受けない別プロセスで実行し、
+    結果はシグナル経由でメインスレッドに通知します
     """
     def __init__(self, sleep_file, hrv_file):
         super().__init__()
         self.sleep_file = sleep_file
         self.hrv_file = hrv_file
         self.signals = WorkerSignals()
+        self.future = None
     
-    def run(self):
+    def start(self):
         """
-        スレッド実行時に呼び出されるメソッド
+        データ処理を別プロセスに投入します
         """
+        # 進捗コールバックはプロセス間で渡せないため、段階的に進捗を通知
+        self.signals.progress.emit(10)
         try:
-            result = process_sleep_hrv_data(
-                self.sleep_file, 
-                self.hrv_file,
-                self.signals.progress.emit
+            self.future = _get_executor().submit(
+                process_sleep_hrv_data, self.sleep_file, self.hrv_file
+            )
+        except BrokenProcessPool:
+            # 前回の処理中にプロセスが異常終了していた場合はプールを作り直す
+            logging.warning("処理プロセスが異常終了していたため、再作成します")
+            _reset_executor()
+            self.future = _get_executor().submit(
+                process_sleep_hrv_data, self.sleep_file, self.hrv_file
             )
-            self.signals.finished.emit(result)
+        self.future.add_done_callback(self._on_done)
+    
+    def _on_done(self, future):
+        """
+        処理完了時に呼び出されるコールバック（実行器のスレッドから呼ばれます）
+        """
+        # シグナルはキュー接続でメインスレッドに届けられる
+        try:
+            result = future.result()
         except Exception as e:
             self.signals.error.emit(str(e))
+            return
+        
+        self.signals.progress.emit(90)
+        self.signals.finished.emit(result)
 
 
 class PdfExportWorker(QThread):
@@ -220,10 +305,6 @@ class MainWindow(QMainWindow):
         # テーブルモデルの更新
         self.table_model.setData(self.result_data)
         
-        # カラム幅の調整
-        for i in range(len(self.result_data.columns)):
-            self.result_table.setColumnWidth(i, 150)
-        
         # 処理完了表示
         self.progress_bar.setValue(100)
         self.progress_bar.setVisible(False)
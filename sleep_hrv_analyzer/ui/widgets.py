@@ -6,7 +6,7 @@
 テーブルモデルなどの特殊なUIコンポーネントを提供します
 """
 
-from PyQt5.QtWidgets import QTableView
+from PyQt5.QtWidgets import QTableView, QHeaderView
 from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSize
 
 class DataTableModel(QAbstractTableModel):
@@ -15,18 +15,33 @@ class DataTableModel(QAbstractTableModel):
     """
     def __init__(self, data=None):
         super().__init__()
-        self._data = data if data is not None else []
+        self._df = None
+        self._data = []
         self._headers = []
+        self._set_source(data)
+    
+    def _set_source(self, data):
+        """
+        表示元のデータを設定します
         
-        # データがDataFrameの場合、ヘッダーとデータを取得
+        DataFrameはリストに変換せずそのまま保持し、表示時に必要なセルのみ参照します
+        """
         if hasattr(data, 'columns'):
+            self._df = data
             self._headers = list(data.columns)
-            self._data = data.values.tolist()
+            self._data = []
+        else:
+            self._df = None
+            self._data = data if data is not None else []
     
     def rowCount(self, parent=QModelIndex()):
+        if self._df is not None:
+            return len(self._df)
         return len(self._data)
     
     def columnCount(self, parent=QModelIndex()):
+        if self._df is not None:
+            return self._df.shape[1]
         return len(self._headers) if self._headers else (len(self._data[0]) if self._data else 0)
     
     def data(self, index, role=Qt.DisplayRole):
@@ -35,6 +50,8 @@ class DataTableModel(QAbstractTableModel):
         
         if role == Qt.DisplayRole:
             try:
+                if self._df is not None:
+                    return str(self._df.iat[index.row(), index.column()])
                 return str(self._data[index.row()][index.column()])
             except (IndexError, TypeError):
                 return None
@@ -60,12 +77,7 @@ class DataTableModel(QAbstractTableModel):
         引数:
             data: 表示するデータ（DataFrameまたはリスト）
         """
-        # pandas DataFrameの場合
-        if hasattr(data, 'columns'):
-            self._headers = list(data.columns)
-            self._data = data.values.tolist()
-        else:
-            self._data = data
+        self._set_source(data)
         
         # モデルが変更されたことを通知
         self.layoutChanged.emit()
@@ -88,7 +100,9 @@ class ResultTableView(QTableView):
         self.setSelectionBehavior(QTableView.SelectRows)
         self.setSelectionMode(QTableView.SingleSelection)
         
-        # サイズ調整
+        # サイズ調整（列幅はヘッダーの既定値で一括設定）
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.horizontalHeader().setDefaultSectionSize(150)
         self.horizontalHeader().setStretchLastSection(True)
         self.verticalHeader().setDefaultSectionSize(28)
     
@@ -9,6 +9,13 @@
 import re
 import logging
 from datetime import datetime
+from functools import lru_cache
+
+# 日本語の時刻表記（例: "午後9:56:00"）
+_JP_TIME_RE = re.compile(r'(午前|午後)(\d+):(\d+):(\d+)')
+
+# 時間帯表記の開始時刻（例: "12 AM - 1 AM" の "12 AM"）
+_TIME_SLOT_RE = re.compile(r'(\d+)\s*(AM|PM)')
 
 def parse_japanese_datetime(datetime_str):
     """
@@ -20,6 +27,8 @@ def parse_japanese_datetime(datetime_str):
     
     戻り値:
         datetime: 変換された日時オブジェクト、変換失敗時はNone
+    
+    単一の文字列用の公開ヘルパーです（AutoSleepの列全体はfile_parserで一括変換します）。
     """
     if not datetime_str or not isinstance(datetime_str, str):
         return None
@@ -29,9 +38,23 @@ def parse_japanese_datetime(datetime_str):
         date_part, time_part = datetime_str.split(' ')
         year, month, day = map(int, date_part.split('-'))
         
-        # 時間部分を処理（午前/午後に対応）
-        pattern = r'(午前|午後)(\d+):(\d+):(\d+)'
-        match = re.match(pattern, time_part)
+        # 固定形式「午前/午後H:MM:SS」は文字列分割で直接解析
+        if time_part.startswith(('午前', '午後')):
+            parts = time_part[2:].split(':')
+            if len(parts) == 3 and all(part.isdigit() for part in parts):
+                hour, minute, second = map(int, parts)
+
+                # 12時間表記の範囲外の時（0時や13時以上）は不正な値として扱う
+                if not 1 <= hour <= 12:
+                    raise ValueError(f"12時間表記の範囲外の時刻です: {hour}")
+
+                # 12時間表記を24時間表記に変換（午前12時は0時、午後12時は12時）
+                hour = hour % 12 + (12 if time_part.startswith('午後') else 0)
+
+                return datetime(year, month, day, hour, minute, second)
+
+        # 固定形式に一致しない場合は正規表現で解析
+        match = _JP_TIME_RE.match(time_part)
         
         if match:
             am_pm = match.group(1)
@@ -83,6 +106,7 @@ def get_date_string(dt, format='%Y/%m/%d'):
         return ""
     return dt.strftime(format)
 
+@lru_cache(maxsize=4096)
 def convert_time_slot_to_hour(time_slot):
     """
     時間帯文字列から時刻（時）を抽出します
@@ -93,8 +117,10 @@ def convert_time_slot_to_hour(time_slot):
     
     戻り値:
         int: 時刻（0-23）、変換失敗時は-1
+    
+    時間帯文字列は24種類程度しかないため結果をキャッシュします
     """
-    match = re.match(r'(\d+)\s*(AM|PM)', time_slot)
+    match = _TIME_SLOT_RE.match(time_slot)
     if match:
         hour = int(match.group(1))
         am_pm = match.group(2)
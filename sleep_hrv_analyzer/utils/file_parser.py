@@ -6,10 +6,84 @@
 特殊形式のCSVファイルを解析します
 """
 
+import csv
+import codecs
 import re
 import logging
 import pandas as pd
-from .date_utils import parse_japanese_datetime, get_date_string
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
+# 日本語を含む日時文字列（例: "2025-03-02 午後9:56:00"）
+_JP_DATETIME_RE = re.compile(r'^(\d+-\d+-\d+) (午前|午後)(\d+):(\d+):(\d+)')
+
+# HRVの範囲値（例: "45.2 - 60.8"）
+_RANGE_RE = re.compile(r'^\s*([\d.]+)\s*-\s*([\d.]+)\s*$')
+
+# エンコーディング推定ができない場合に試行するエンコーディング
+_FALLBACK_ENCODINGS = ['utf-8', 'shift-jis', 'cp932', 'euc-jp']
+
+# エンコーディング推定に使用するファイル先頭のバイト数
+_DETECT_SAMPLE_SIZE = 8192
+
+def _detect_encoding(file_path):
+    """
+    charset_normalizerでファイルのエンコーディングを推定します
+    
+    ファイル全体を解析すると読み込み直すより遅くなるため、先頭部分のみを使用します
+    
+    引数:
+        file_path (str): ファイルのパス
+    
+    戻り値:
+        str: 推定されたエンコーディング、推定できない場合はNone
+    """
+    if from_bytes is None:
+        return None
+    
+    with open(file_path, 'rb') as f:
+        sample = f.read(_DETECT_SAMPLE_SIZE)
+    
+    # マルチバイト文字の途中で切れないよう、最後の改行までに限定
+    sample = sample[:sample.rfind(b'\n') + 1] or sample
+    
+    best = from_bytes(sample).best()
+    return best.encoding if best else None
+
+def _parse_japanese_datetime_column(series):
+    """
+    日本語を含む日時文字列の列をまとめてdatetimeに変換します
+    
+    parse_japanese_datetimeと同じ規則（午前12時は0時、午後は12時間追加）で変換します。
+    %p（AM/PM）はロケールに依存するため使用せず、各部分を抽出して組み立てます
+    
+    引数:
+        series (pandas.Series): 変換する日時文字列の列
+    
+    戻り値:
+        pandas.Series: 変換された日時の列、変換失敗時はNaT
+    
+    例:
+        >>> _parse_japanese_datetime_column(pd.Series(
+        ...     ['2025-03-02 午後9:56:00', '2025-03-03 午前12:05:00',
+        ...      '2025-03-03 午後13:00:00', 'bad'])).tolist()
+        [Timestamp('2025-03-02 21:56:00'), Timestamp('2025-03-03 00:05:00'), NaT, NaT]
+    """
+    parts = series.astype(str).str.extract(_JP_DATETIME_RE)
+    dates = pd.to_datetime(parts[0], format='%Y-%m-%d', errors='coerce')
+    hour, minute, second = (parts[i].astype(float) for i in (2, 3, 4))
+    
+    # 12時間表記の範囲外の時（0時や13時以上）や範囲外の分・秒は変換失敗として扱う
+    valid = hour.between(1, 12) & (minute < 60) & (second < 60)
+    
+    # 12時間表記を24時間表記に変換
+    hour = hour % 12 + (parts[1] == '午後') * 12
+    seconds = (hour * 3600 + minute * 60 + second).where(valid)
+    
+    return dates + pd.to_timedelta(seconds, unit='s')
 
 def read_autosleep_data(file_path):
     """
@@ -29,35 +103,52 @@ def read_autosleep_data(file_path):
         '睡眠': 'Sleep Duration'
     }
     
-    # ファイル読み込み（エンコーディング自動検出）
-    try:
-        df = pd.read_csv(file_path, encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            df = pd.read_csv(file_path, encoding='shift-jis')
-        except UnicodeDecodeError:
-            df = pd.read_csv(file_path, encoding='cp932')
-    
-    # 必要な列のみを選択（存在する場合）
+    # 必要な列（AutoSleepの出力には他にも多数の列があります）
     required_columns = ['就寝時間', '起床時間', '平均呼吸', '睡眠']
-    existing_columns = [col for col in required_columns if col in df.columns]
     
-    # 最低限必要な列がなければエラー
-    if '就寝時間' not in existing_columns or '起床時間' not in existing_columns:
+    # ファイル読み込み（エンコーディングを推定し、必要な列のみ解析）
+    # 推定したエンコーディングで読めない場合は従来の候補を順に試行
+    detected_encoding = _detect_encoding(file_path)
+    detected_codec = codecs.lookup(detected_encoding).name if detected_encoding else None
+    encodings = [detected_encoding] if detected_encoding else []
+    encodings += [enc for enc in _FALLBACK_ENCODINGS if codecs.lookup(enc).name != detected_codec]
+    
+    df = None
+    decode_error = None
+    columns_missing = False
+    for encoding in encodings:
+        try:
+            candidate_df = pd.read_csv(
+                file_path, encoding=encoding,
+                usecols=lambda col: col in required_columns
+            )
+        except UnicodeDecodeError as e:
+            decode_error = e
+            continue
+        
+        # 誤ったエンコーディングでも読めてしまい列名が文字化けする場合があるため、
+        # 必須列が見つからない場合も次の候補を試行
+        if '就寝時間' in candidate_df.columns and '起床時間' in candidate_df.columns:
+            df = candidate_df
+            break
+        columns_missing = True
+    
+    # いずれの候補でも読めない場合はエラー
+    if df is None:
+        if decode_error is not None and not columns_missing:
+            raise decode_error
         raise ValueError("必須列「就寝時間」または「起床時間」がCSVファイルに見つかりません")
     
-    # 必要な列のみのデータフレームを作成
-    selected_df = df[existing_columns].copy()
-    
     # 日本語カラム名を英語に変換
-    selected_df = selected_df.rename(columns=column_map)
+    selected_df = df.rename(columns=column_map)
     
-    # 日時データの解析
-    selected_df['Bedtime_dt'] = selected_df['Bedtime'].apply(parse_japanese_datetime)
-    selected_df['Wakeup_dt'] = selected_df['Wakeup'].apply(parse_japanese_datetime)
+    # 日時データの解析（列ごとにまとめて変換、解析できない値はNaTになります）
+    selected_df['Bedtime_dt'] = _parse_japanese_datetime_column(selected_df['Bedtime'])
+    selected_df['Wakeup_dt'] = _parse_japanese_datetime_column(selected_df['Wakeup'])
     
     # 基準日（起床日）を計算 - 修正箇所：就寝日から起床日に変更
-    selected_df['Date'] = selected_df['Wakeup_dt'].apply(lambda dt: get_date_string(dt))
+    # HRVデータの日付（YYYY/MM/DD形式）と同じ形式で、HRVデータの検索キーにも使用
+    selected_df['Date'] = selected_df['Wakeup_dt'].dt.strftime('%Y/%m/%d').fillna('')
     
     return selected_df
 
@@ -74,47 +165,43 @@ def parse_hrv_file(file_path):
     hrv_data = {}
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
             
             # ファイルが少なくとも2行あることを確認
-            if len(lines) < 2:
+            header1 = next(reader, None)
+            header2 = next(reader, None)
+            if header1 is None or header2 is None:
                 raise ValueError("HRVファイルの形式が不正です（ヘッダー行がありません）")
             
             # ヘッダー行から時間帯を抽出 (2行目)
-            header = lines[1].strip()
-            time_slots = [slot.strip() for slot in header.split(',')[1:]]
+            time_slots = [slot.strip() for slot in header2[1:]]
             
             # 各データ行を処理 (3行目以降)
-            for i in range(2, len(lines)):
-                line = lines[i].strip()
-                if not line:
+            for row in reader:
+                if not row or not any(value.strip() for value in row):
                     continue
                 
-                values = line.replace('"', '').split(',')
-                date = values[0].strip()  # YYYY/MM/DD形式
+                date = row[0].strip()  # YYYY/MM/DD形式
                 
                 # 各時間帯のHRV値を抽出
                 date_hrv = {}
-                for j, value in enumerate(values[1:], 0):
-                    if j < len(time_slots) and value.strip():
-                        slot = time_slots[j]
-                        
-                        # 範囲値 "X - Y" の処理
-                        if ' - ' in value:
-                            parts = value.split(' - ')
-                            if len(parts) == 2:
-                                try:
-                                    min_val = float(parts[0])
-                                    max_val = float(parts[1])
-                                    date_hrv[slot] = (min_val + max_val) / 2
-                                except ValueError:
-                                    pass
+                for slot, value in zip(time_slots, row[1:]):
+                    value = value.strip()
+                    if not value:
+                        continue
+                    
+                    # 範囲値 "X - Y" の処理
+                    match = _RANGE_RE.match(value)
+                    try:
+                        if match:
+                            min_val = float(match.group(1))
+                            max_val = float(match.group(2))
+                            date_hrv[slot] = (min_val + max_val) / 2
                         else:
-                            try:
-                                date_hrv[slot] = float(value)
-                            except ValueError:
-                                pass
+                            date_hrv[slot] = float(value)
+                    except ValueError:
+                        pass
                 
                 hrv_data[date] = date_hrv
     
@@ -136,4 +223,4 @@ def filter_ascii_only(text):
     """
     if not isinstance(text, str):
         text = str(text)
-    return ''.join(c for c in text if ord(c) < 128)
\ No newline at end of file
+    return text.encode('ascii', errors='ignore').decode('ascii')
\ No newline at end of file
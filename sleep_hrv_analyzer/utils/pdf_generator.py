@@ -10,9 +10,18 @@ import logging
 import pandas as pd
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet
-from .file_parser import filter_ascii_only
+
+# 結果テーブルのスタイル
+_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+])
 
 def generate_pdf_report(file_path, result_data, autosleep_data=None, hrv_data=None):
     """
@@ -29,9 +38,6 @@ def generate_pdf_report(file_path, result_data, autosleep_data=None, hrv_data=No
         styles = getSampleStyleSheet()
         elements = []
         
-        # 最大表示行数
-        MAX_ROWS = 30
-        
         # タイトル
         title = Paragraph("Sleep and HRV Analysis Report", styles['Title'])
         elements.append(title)
@@ -43,37 +49,18 @@ def generate_pdf_report(file_path, result_data, autosleep_data=None, hrv_data=No
             elements.append(Spacer(1, 10))
             
             # 非ASCII文字をフィルタリング
-            filtered_data = result_data.applymap(filter_ascii_only)
+            filtered_data = result_data.astype(str).apply(
+                lambda col: col.str.encode('ascii', 'ignore').str.decode('ascii')
+            )
             
-            # テーブルデータの作成
-            table_data = [list(filtered_data.columns)]
+            # テーブルデータの作成（全行を出力）
+            table_data = [list(filtered_data.columns)] + filtered_data.values.tolist()
             
-            # 最大表示行数までのデータを追加
-            display_rows = min(len(filtered_data), MAX_ROWS)
-            for i in range(display_rows):
-                table_data.append(list(filtered_data.iloc[i]))
-            
-            # テーブル作成
-            table = Table(table_data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ]))
+            # テーブル作成（ページをまたぐ場合は見出し行を各ページに再表示）
+            table = LongTable(table_data, repeatRows=1)
+            table.setStyle(_TABLE_STYLE)
             
             elements.append(table)
-            
-            # 表示されていないデータに関する情報
-            if len(filtered_data) > MAX_ROWS:
-                not_shown_info = Paragraph(
-                    f"Note: Showing {display_rows} of {len(filtered_data)} rows. {len(filtered_data) - display_rows} rows are not displayed.",
-                    styles['Italic']
-                )
-                elements.append(Spacer(1, 10))
-                elements.append(not_shown_info)
         
         # PDF生成
         doc.build(elements)